@@ -3,87 +3,52 @@
 Build script for packaging the Modbus RTU Simulator into a standalone executable.
 """
 
+import hashlib
+import shutil
 import subprocess
 import sys
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def build_executable():
-    """Build the executable using PyInstaller"""
-    
-    # PyInstaller command
-    cmd = [
-        "python", "-m", "uv", "run", "pyinstaller",
-        "--onefile",                    # Create a single executable file
-        "--windowed",                   # No console window (GUI only)
-        "--name=ModbusSimulator",       # Name of the executable
-        "--icon=icon.ico",              # Optional: add an icon (if you have one)
-        "--add-data=README.md;.",       # Include README
-        "--hidden-import=tkinter",      # Ensure tkinter is included
-        "--hidden-import=pymodbus",     # Ensure pymodbus is included
-        "--hidden-import=serial",       # Ensure pyserial is included
-        "--hidden-import=serial.tools", # Ensure serial tools are included
-        "modbus_simulator_gui.py"       # Main script
-    ]
-    
-    # Remove icon option if no icon file exists
-    if not Path("icon.ico").exists():
-        cmd = [c for c in cmd if not c.startswith("--icon")]
-    
-    print("Building Modbus Simulator executable with PyInstaller...")
-    print(f"Command: {' '.join(cmd)}")
-    
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print("Build successful!")
-        print(f"Executable created at: dist/ModbusSimulator.exe")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Build failed: {e}")
-        print(f"Error output: {e.stderr}")
-        return False
+# Number of PyInstaller output lines repeated when a build fails
+BUILD_LOG_TAIL = 200
 
-def create_portable_package():
-    """Create a portable package with the executable and documentation"""
-    
-    dist_dir = Path("dist")
-    portable_dir = Path("ModbusSimulator_Portable")
-    
-    if not dist_dir.exists():
-        print("No dist directory found. Run build first.")
-        return False
-    
-    # Create portable directory
-    portable_dir.mkdir(exist_ok=True)
-    
-    # Copy executable
-    exe_file = dist_dir / "ModbusSimulator.exe"
-    if exe_file.exists():
-        import shutil
-        shutil.copy2(exe_file, portable_dir / "ModbusSimulator.exe")
-        
-        # Copy README if it exists
-        if Path("README.md").exists():
-            shutil.copy2("README.md", portable_dir / "README.md")
-        
-        # Create a sample configuration file
-        sample_config = portable_dir / "sample_config.json"
-        with open(sample_config, 'w') as f:
-            f.write("""{
+# PyInstaller work directories, one per distinct set of PyInstaller options
+CACHE_DIR = Path(".pyi-cache")
+
+# PyInstaller --onedir output folder and the executable inside it
+APP_DIR = Path("dist") / "ModbusSimulator"
+EXE_FILE = APP_DIR / "ModbusSimulator.exe"
+
+# Files whose contents decide whether the executable must be rebuilt
+BUILD_INPUTS = ("modbus_simulator_gui.py", "README.md", "icon.ico")
+
+# Digest of the inputs that produced the current executable
+BUILD_HASH_FILE = Path("dist") / ".build.hash"
+
+# Linux ioctl that shares file extents on copy-on-write filesystems (btrfs, xfs)
+FICLONE = 0x40049409
+
+# Sample configuration shipped with the portable package (encoded once at import)
+SAMPLE_CONFIG = """{
   "port": "COM1",
   "baudrate": "115200",
   "slave_id": "1",
+  "timeout": "0.5",
+  "retries": "0",
   "command_type": "Read Holding Registers",
   "address": "0",
-  "count": "1"
-}""")
-        
-        # Create a quick start guide
-        quick_start = portable_dir / "QUICK_START.txt"
-        with open(quick_start, 'w') as f:
-            f.write("""Modbus RTU Simulator - Quick Start Guide
+  "count": "1",
+  "read_cache_ttl": "0"
+}""".encode("utf-8")
+
+# Quick start guide shipped with the portable package (encoded once at import)
+QUICK_START = """Modbus RTU Simulator - Quick Start Guide
 
 1. CONNECTION SETUP:
+   - Start the application with ModbusSimulator/ModbusSimulator.exe
    - Connect your Modbus device via serial port
    - Select the correct COM port (e.g., COM1, COM2)
    - Set baud rate (default: 115200)
@@ -116,20 +81,212 @@ def create_portable_package():
    - 0x prefix for hex values
 
 For more help, check the log messages in the application.
-""")
-        
-        print(f"Portable package created at: {portable_dir}")
-        print("Contents:")
-        for file in portable_dir.iterdir():
-            print(f"  - {file.name}")
+""".encode("utf-8")
+
+def build_cache_key(cmd):
+    """Hash the PyInstaller options into a work path key
+
+    Sources are left out on purpose: PyInstaller rebuilds whatever changed in
+    the work directory itself, so one directory per option set is enough.
+    """
+    return hashlib.sha256(repr(cmd).encode()).hexdigest()[:16]
+
+def build_manifest(cmd):
+    """Hash every build input and the PyInstaller command"""
+    manifest = hashlib.blake2b()
+    for name in BUILD_INPUTS:
+        path = Path(name)
+        if path.exists():
+            manifest.update(name.encode() + b"|" + path.read_bytes())
+    manifest.update(repr(cmd).encode())
+    return manifest.hexdigest()
+
+def start_build():
+    """Launch PyInstaller in the background
+
+    Returns the running process (None when the executable is already up to
+    date) and the manifest digest to record once the build succeeds.
+    """
+
+    # PyInstaller command
+    cmd = [
+        # Run PyInstaller from the current interpreter (activate the venv first)
+        sys.executable, "-m", "PyInstaller",
+        "--onedir",                     # Folder build: no extraction to temp at startup
+        "--noconfirm",                  # Replace the previous output folder without prompting
+        "--noupx",                      # Skip UPX compression even if it is installed
+        "--windowed",                   # No console window (GUI only)
+        "--name=ModbusSimulator",       # Name of the executable
+        "--add-data=README.md;.",       # Include README
+        "--hidden-import=tkinter",      # Ensure tkinter is included
+        "--hidden-import=pymodbus",     # Ensure pymodbus is included
+        "--hidden-import=serial",       # Ensure pyserial is included
+        "--hidden-import=serial.tools", # Ensure serial tools are included
+        "--exclude-module=tkinter.test",   # Tkinter test suite
+        "--exclude-module=unittest",       # Test framework, unused at runtime
+        "--exclude-module=pydoc_data",     # pydoc topic data
+        "--exclude-module=test",           # CPython regression tests
+        "--exclude-module=pymodbus.server",# Client-only application
+        "modbus_simulator_gui.py"       # Main script
+    ]
+
+    # Add an icon only if an icon file exists
+    if Path("icon.ico").exists():
+        cmd.insert(-1, "--icon=icon.ico")
+
+    # Reuse the Analysis/PYZ output of a previous build with identical options
+    workpath = CACHE_DIR / build_cache_key(cmd)
+    cmd.insert(-1, f"--workpath={workpath}")
+
+    # Skip PyInstaller entirely when nothing changed since the last build
+    manifest = build_manifest(cmd)
+    if EXE_FILE.exists() and BUILD_HASH_FILE.exists() and BUILD_HASH_FILE.read_text() == manifest:
+        print(f"Executable is up to date: {EXE_FILE}")
+        return None, manifest
+    BUILD_HASH_FILE.unlink(missing_ok=True)
+
+    print("Building Modbus Simulator executable with PyInstaller...")
+    print(f"Command: {' '.join(cmd)}")
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    return process, manifest
+
+def wait_for_build(process, manifest):
+    """Wait for a PyInstaller process started by start_build"""
+    if process is None:
+        return True
+
+    # Stream PyInstaller output as it arrives, keeping only the tail for errors
+    tail = deque(maxlen=BUILD_LOG_TAIL)
+    for line in process.stdout:
+        sys.stdout.write(line)
+        tail.append(line)
+    process.stdout.close()
+
+    rc = process.wait()
+    if rc != 0:
+        print(f"Build failed: PyInstaller returned non-zero exit status {rc}.")
+        print(f"Error output (last {len(tail)} lines):")
+        print("".join(tail), end="")
+        return False
+
+    BUILD_HASH_FILE.write_text(manifest)
+
+    print("Build successful!")
+    print(f"Executable created at: {EXE_FILE}")
+    return True
+
+def build_executable():
+    """Build the executable using PyInstaller"""
+    return wait_for_build(*start_build())
+
+def reflink_or_copy(src, dst):
+    """Clone a file on copy-on-write filesystems, falling back to a real copy"""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                import fcntl
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except (ImportError, OSError):
+                # No reflink: let the kernel copy in place (server-side on NFS)
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    count = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+    except (AttributeError, OSError):
+        # shutil uses the platform fast path (sendfile, fcopyfile, large buffers)
+        shutil.copy2(src, dst)
+        return
+    shutil.copystat(src, dst)
+
+def copy_app_dir(portable_dir):
+    """Copy the PyInstaller output folder into the portable package"""
+    target = portable_dir / APP_DIR.name
+    # Drop files left over from a previous build before copying, including the
+    # single ModbusSimulator.exe of an earlier --onefile build
+    shutil.rmtree(target, ignore_errors=True)
+    (portable_dir / EXE_FILE.name).unlink(missing_ok=True)
+    shutil.copytree(APP_DIR, target, copy_function=reflink_or_copy)
+
+def stage_portable_files(executor, portable_dir):
+    """Write the documentation files of the portable package on the executor"""
+
+    futures = [
+        # Create a sample configuration file
+        executor.submit((portable_dir / "sample_config.json").write_bytes, SAMPLE_CONFIG),
+        # Create a quick start guide
+        executor.submit((portable_dir / "QUICK_START.txt").write_bytes, QUICK_START),
+    ]
+
+    # Copy README if it exists
+    if Path("README.md").exists():
+        futures.append(executor.submit(shutil.copy2, "README.md", portable_dir / "README.md"))
+
+    return futures
+
+def list_portable_package(portable_dir):
+    """Print the contents of the portable package"""
+    print(f"Portable package created at: {portable_dir}")
+    print("Contents:")
+    with os.scandir(portable_dir) as entries:
+        print("\n".join(f"  - {entry.name}" for entry in entries))
+
+def create_portable_package():
+    """Create a portable package with the executable and documentation"""
+
+    dist_dir = Path("dist")
+    portable_dir = Path("ModbusSimulator_Portable")
+
+    if not dist_dir.exists():
+        print("No dist directory found. Run build first.")
+        return False
+
+    # Copy executable folder
+    if EXE_FILE.exists():
+        # Create portable directory
+        portable_dir.mkdir(exist_ok=True)
+
+        with ThreadPoolExecutor() as executor:
+            futures = stage_portable_files(executor, portable_dir)
+            futures.append(executor.submit(copy_app_dir, portable_dir))
+            for future in futures:
+                future.result()
+
+        list_portable_package(portable_dir)
         return True
     else:
         print("Executable not found in dist directory")
         return False
 
+def build_and_package():
+    """Build the executable and stage the portable package while PyInstaller runs"""
+    portable_dir = Path("ModbusSimulator_Portable")
+    portable_dir.mkdir(exist_ok=True)
+
+    process, manifest = start_build()
+    with ThreadPoolExecutor() as executor:
+        # Documentation does not depend on the executable, so write it during the build
+        futures = stage_portable_files(executor, portable_dir)
+        built = wait_for_build(process, manifest)
+        for future in futures:
+            future.result()
+
+        if not built:
+            return False
+
+        if not EXE_FILE.exists():
+            print("Executable not found in dist directory")
+            return False
+        executor.submit(copy_app_dir, portable_dir).result()
+
+    list_portable_package(portable_dir)
+    return True
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "portable":
         create_portable_package()
     else:
-        if build_executable():
-            create_portable_package()
+        build_and_package()
@@ -7,6 +7,7 @@ with timestamp logging and command history.
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
+import tkinter.font as tkfont
 import serial
 import serial.tools.list_ports
 from pymodbus.client import ModbusSerialClient
@@ -16,10 +17,280 @@ import time
 import json
 import csv
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Deque
 import queue
+from collections import deque
 import os
+import io
+import re
+import array
+import struct
+import operator
+from dataclasses import dataclass
 
+try:
+    import numpy as np
+    import numba
+except ImportError:
+    # Optional JIT acceleration for CRC16 (pip install modbus-simulator[jit])
+    np = None
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON export (pip install modbus-simulator[json])
+    orjson = None
+
+
+# Seconds a serial port scan is reused before Refresh scans again
+_PORTS_CACHE_TTL = 1.0
+
+# A whole raw command line: 2-digit hex bytes separated by ASCII whitespace
+# (the separators bytes.fromhex accepts)
+_HEX_LINE_RE = re.compile(r'[0-9A-Fa-f]{2}(?:[ \t\n\r\f\v]+[0-9A-Fa-f]{2})*\Z')
+
+# Register entry text holding a value: 1-4 hex digits, optionally prefixed with 0x
+_REG_TEXT_RE = re.compile(r'(?:0[xX])?[0-9A-Fa-f]{1,4}\Z')
+# A register entry ready to write as a holding register: exactly 4 hex digits
+_REG_WORD_RE = re.compile(r'(?:0[xX])?[0-9A-Fa-f]{4}\Z')
+
+# Deletes every ASCII character (spaces included) that is not an upper-case hex digit
+# (non-ASCII characters are dropped separately with encode('ascii', 'ignore'))
+_NON_HEX_DEL = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in '0123456789ABCDEF'))
+
+# Commands kept in the history used for CSV/JSON export
+_HISTORY_MAX = 10000
+
+# Input StringVars and the plain attributes that mirror them
+_MIRRORED_VARS = (
+    ("port_var", "_port"),
+    ("baud_var", "_baud"),
+    ("slave_id_var", "_slave_id"),
+    ("timeout_var", "_timeout"),
+    ("retries_var", "_retries"),
+    ("cmd_type_var", "_cmd_type"),
+    ("start_idx_var", "_start_idx"),
+    ("length_var", "_length"),
+    ("raw_bytes_var", "_raw_bytes"),
+)
+
+# Register text shown for a coil that is off / on
+_COIL_HEX = ("0x0000", "0x0001")
+
+# Index labels of the 8x8 register grid
+_REG_LABELS = tuple(f"{i:02d}" for i in range(64))
+
+# Window (ms) in which consecutive reads are merged into one request
+_READ_COALESCE_MS = 20
+
+# Settings file loaded at startup
+_SETTINGS_FILE = 'modbus_settings.json'
+
+# Log colors per level
+_LOG_COLORS = {
+    'INFO': 'black',
+    'SUCCESS': 'green',
+    'ERROR': 'red',
+    'WARNING': 'orange'
+}
+
+# Maximum log entries displayed per batch
+_LOG_BATCH_MAX = 500
+
+# Lines kept in the log display; older lines are dropped
+_LOG_MAX_LINES = 5000
+
+# Minimum interval (ms) between auto-scrolls of the log display (~30 Hz)
+_LOG_SEE_MS = 33
+
+
+def _build_crc16_table():
+    """Precompute the Modbus CRC16 (polynomial 0xA001) remainder for every byte value"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x01:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc = crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+# CRC16 lookup table, one entry per byte value (a tuple hands back its stored
+# ints, where indexing an array('H') boxes a new int on every lookup)
+_CRC16_TABLE = _build_crc16_table()
+
+# Frames shorter than this are faster in pure Python than via the JIT call overhead
+_CRC16_JIT_MIN_LEN = 32
+
+def _crc16_kernel(buf, table):
+    """Table-driven CRC16 over a uint8 array, compiled to native code by numba"""
+    crc = 0xFFFF
+    for byte in buf:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+_crc16_numba = None
+if numba is not None:
+    _CRC16_TABLE_NP = np.array(_CRC16_TABLE, dtype=np.uint16)
+
+    # Explicit signature: compiled (or loaded from cache) once at import for the
+    # read-only arrays np.frombuffer returns over frame bytes
+    try:
+        _CRC16_NUMBA_SIG = numba.uint16(numba.types.Array(numba.uint8, 1, 'C', readonly=True), numba.uint16[::1])
+        _crc16_numba = numba.njit(_CRC16_NUMBA_SIG, cache=True)(_crc16_kernel)
+    except Exception:
+        # Compilation or cache setup failed (e.g. no cache locator in a frozen build):
+        # keep the pure Python table loop
+        _crc16_numba = None
+
+
+def _build_read_frame(slave_id, function_code, start_idx, length, values=None):
+    """Build a read request frame (FC 0x01, 0x03, 0x04) without CRC"""
+    # Slave ID, function code, start address, quantity (big-endian)
+    return struct.pack(">BBHH", slave_id, function_code, start_idx, length)
+
+
+def _build_write_registers_frame(slave_id, function_code, start_idx, length, values):
+    """Build a Write Multiple Registers (FC 0x10) frame without CRC"""
+    # Header with byte count (2 bytes per register) followed by the register values
+    return struct.pack(f">BBHHB{length}H", slave_id, function_code, start_idx, length, length * 2, *values)
+
+
+def _build_write_single_frame(slave_id, function_code, start_idx, length, values):
+    """Build a Write Single Register (FC 0x06) frame without CRC"""
+    return struct.pack(">BBHH", slave_id, function_code, start_idx, values[0])
+
+
+def _build_write_coils_frame(slave_id, function_code, start_idx, length, values):
+    """Build a Write Multiple Coils (FC 0x0F) frame without CRC"""
+    byte_count = (length + 7) // 8  # Calculate bytes needed for coils
+    header = struct.pack(">BBHHB", slave_id, function_code, start_idx, length, byte_count)
+    # Pack coils into bytes, first coil in the least significant bit
+    bits = ''.join('1' if value else '0' for value in reversed(values[:length]))
+    return header + int(bits or '0', 2).to_bytes(byte_count, 'little')
+
+
+def _hex_words(values):
+    """Format 16-bit values as 4-digit uppercase hex strings in one hex() call"""
+    text = struct.pack(f">{len(values)}H", *values).hex().upper()
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+def _merge_read_ranges(reads):
+    """Merge overlapping or adjacent (cmd_type, slave_id, start, length) reads per command and device"""
+    ranges: Dict[tuple, List[List[int]]] = {}
+    for cmd_type, slave_id, start_idx, length in reads:
+        ranges.setdefault((cmd_type, slave_id), []).append([start_idx, start_idx + length])
+    
+    merged = []
+    for (cmd_type, slave_id), spans in ranges.items():
+        spans.sort()
+        current = spans[0]
+        for span in spans[1:]:
+            if span[0] <= current[1]:
+                current[1] = max(current[1], span[1])
+            else:
+                merged.append((cmd_type, slave_id, current[0], current[1] - current[0]))
+                current = span
+        merged.append((cmd_type, slave_id, current[0], current[1] - current[0]))
+    return merged
+
+
+# Function code and frame builder per command type
+_CMD_SPEC = {
+    "Read Holding Registers": (0x03, _build_read_frame),
+    "Write Holding Registers": (0x10, _build_write_registers_frame),
+    "Write Single Register": (0x06, _build_write_single_frame),
+    "Read Input Registers": (0x04, _build_read_frame),
+    "Read Coils": (0x01, _build_read_frame),
+    "Write Coils": (0x0F, _build_write_coils_frame),
+}
+
+# PyModbus client method per command type and whether it sends values
+_CLIENT_CALLS = {
+    "Read Holding Registers": ("read_holding_registers", False),
+    "Write Holding Registers": ("write_registers", True),
+    "Write Single Register": ("write_register", True),
+    "Read Input Registers": ("read_input_registers", False),
+    "Read Coils": ("read_coils", False),
+    "Write Coils": ("write_coils", True),
+}
+
+
+# Largest Modbus RTU frame; read when a raw request's response length is unknown
+_RTU_MAX_FRAME = 256
+
+
+def _expected_rtu_response_size(frame):
+    """Return the normal response length (with CRC) for a raw request, or None if unknown"""
+    function_code = frame[1]
+    if function_code in (0x05, 0x06, 0x0F, 0x10):
+        # Echo of slave ID, function code, address and value/quantity
+        return 8
+    if len(frame) < 6:
+        return None
+    quantity = (frame[4] << 8) | frame[5]
+    if function_code in (0x01, 0x02):
+        # Slave ID, function code, byte count, packed bits, CRC
+        return 5 + (quantity + 7) // 8
+    if function_code in (0x03, 0x04):
+        # Slave ID, function code, byte count, registers, CRC
+        return 5 + 2 * quantity
+    return None
+
+
+def _rtu_silent_interval(baudrate):
+    """Return the RTU inter-frame gap in seconds: 3.5 character times (11 bits each), 1.75 ms above 19200 baud"""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * 11 / baudrate
+
+
+def _raw_exchange(client, frame, response_size):
+    """Write a raw RTU frame and read its response (runs on the Modbus worker)"""
+    # Looked up on every call: pymodbus closes or replaces the port object on errors
+    port = getattr(client, 'socket', None)
+    if port is None:
+        raise ConnectionError("No active serial connection")
+    # Drop stale bytes so they are not taken for this response
+    port.reset_input_buffer()
+    port.write(frame)
+    if response_size is None:
+        # Unknown length: collect whatever arrives before the serial timeout
+        return port.read(_RTU_MAX_FRAME)
+    # Exception responses are 5 bytes, and every normal response is at least that long
+    response = port.read(5)
+    if len(response) == 5 and not response[1] & 0x80:
+        response += port.read(response_size - 5)
+    return response
+
+
+@dataclass
+class CmdRecord:
+    """One command history entry (register commands leave raw_bytes None, raw commands the rest)"""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('timestamp', 'command', 'address', 'count', 'values', 'response_time_ms', 'success', 'raw_bytes')
+    timestamp: str
+    command: str
+    address: Optional[int]
+    count: Optional[int]
+    values: Any
+    response_time_ms: float
+    success: bool
+    raw_bytes: Optional[str]
+    
+    def as_dict(self):
+        """Return the record as a field name -> value dict for export"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Field values of a CmdRecord in column order, for CSV rows
+_RECORD_FIELDS = operator.attrgetter(*CmdRecord.__slots__)
 
 
 class ModbusSimulatorGUI:
@@ -34,15 +305,51 @@ class ModbusSimulatorGUI:
         self.is_connected = False
         
         # Command history and logging
-        self.command_history: List[Dict[str, Any]] = []
-        self.log_queue = queue.Queue()
+        # Bounded so long sessions keep only the most recent commands
+        self.command_history: Deque[CmdRecord] = deque(maxlen=_HISTORY_MAX)
+        self.log_queue = queue.SimpleQueue()
+        
+        # Pending auto-scroll of the log display
+        self._log_see_id = None
+        
+        # Wall-clock second last formatted for log timestamps, and its "HH:MM:SS" text
+        self._ts_sec = None
+        self._ts_str = ""
+        
+        # Reads waiting for the coalescing window to close: (cmd_type, slave_id, start, length)
+        self._pending_reads: List[tuple] = []
+        self._read_flush_id = None
+        
+        # Recent read results keyed by (slave_id, function_code, start, length);
+        # entries younger than _read_ttl seconds are reused (0 disables caching;
+        # set with "read_cache_ttl" in the settings file)
+        self._read_cache: Dict[tuple, tuple] = {}
+        self._read_ttl = 0.0
+        # Bumped whenever the cache is invalidated so reads already in flight don't repopulate it
+        self._cache_gen = 0
+        
+        # PyModbus calls run on a worker thread; results come back through _result_queue
+        self._cmd_queue = queue.SimpleQueue()
+        self._result_queue = queue.Queue()
+        self._client_lock = threading.Lock()
+        self._silent_interval = _rtu_silent_interval(115200)
+        threading.Thread(target=self._modbus_worker, daemon=True).start()
+        
+        # Serial ports from the last scan and the monotonic time it finished
+        self._ports_cache: List[str] = []
+        self._ports_ts = None
+        self._ports_scanning = False
+        
+        # (file, hash) key of the settings last loaded or saved
+        self._settings_key = None
         
         # Create GUI
         self.create_widgets()
+        self.mirror_input_vars()
         self.setup_layout()
         
-        # Start log processing thread
-        self.start_log_processor()
+        # Start log processing thread once the main loop runs, since it hands batches to Tk
+        self.root.after_idle(self.start_log_processor)
         
         # Load saved settings
         self.load_settings()
@@ -75,18 +382,31 @@ class ModbusSimulatorGUI:
         # Slave ID
         ttk.Label(controls_container, text="Slave ID:").grid(row=0, column=5, sticky="w", padx=(0, 5))
         self.slave_id_var = tk.StringVar(value="1")
-        slave_id_values = [str(i) for i in range(1, 256)]  # 1 to 255
-        slave_id_combo = ttk.Combobox(controls_container, textvariable=self.slave_id_var, 
-                                     values=slave_id_values, width=5, state="readonly")
-        slave_id_combo.grid(row=0, column=6, padx=(0, 10))
+        slave_id_spin = ttk.Spinbox(controls_container, textvariable=self.slave_id_var,
+                                    from_=1, to=255, width=5, state="readonly")  # 1 to 255
+        slave_id_spin.grid(row=0, column=6, padx=(0, 10))
+        
+        # Response timeout in seconds
+        ttk.Label(controls_container, text="Timeout (s):").grid(row=0, column=7, sticky="w", padx=(0, 5))
+        self.timeout_var = tk.StringVar(value="0.5")
+        timeout_spin = ttk.Spinbox(controls_container, textvariable=self.timeout_var,
+                                   from_=0.1, to=10.0, increment=0.1, width=5)
+        timeout_spin.grid(row=0, column=8, padx=(0, 10))
+        
+        # Retries after a failed transaction (errors are reported in the log)
+        ttk.Label(controls_container, text="Retries:").grid(row=0, column=9, sticky="w", padx=(0, 5))
+        self.retries_var = tk.StringVar(value="0")
+        retries_spin = ttk.Spinbox(controls_container, textvariable=self.retries_var,
+                                   from_=0, to=5, width=3, state="readonly")
+        retries_spin.grid(row=0, column=10, padx=(0, 10))
         
         # Connect button
         self.connect_btn = ttk.Button(controls_container, text="Connect", command=self.connect)
-        self.connect_btn.grid(row=0, column=7, padx=(0, 5))
+        self.connect_btn.grid(row=0, column=11, padx=(0, 5))
         
         # Disconnect button
         self.disconnect_btn = ttk.Button(controls_container, text="Disconnect", command=self.disconnect, state="disabled")
-        self.disconnect_btn.grid(row=0, column=8, padx=(5, 0))
+        self.disconnect_btn.grid(row=0, column=12, padx=(5, 0))
         
         # Status label - centered
         self.status_var = tk.StringVar(value="Disconnected")
@@ -112,6 +432,8 @@ class ModbusSimulatorGUI:
         # Log text area (minimized)
         self.log_text = scrolledtext.ScrolledText(self.results_frame, height=8, width=80)
         self.log_text.grid(row=0, column=0, columnspan=2, sticky="nsew", pady=(0, 10))
+        for level, color in _LOG_COLORS.items():
+            self.log_text.tag_config(level, foreground=color)
         
         # Export buttons
         export_frame = ttk.Frame(self.results_frame)
@@ -144,18 +466,16 @@ class ModbusSimulatorGUI:
         # Start register index
         ttk.Label(control_frame, text="Start Index:").grid(row=0, column=2, sticky="w", padx=(0, 5))
         self.start_idx_var = tk.StringVar(value="0")
-        start_idx_values = [str(i) for i in range(0, 64)]  # 0 to 63
-        start_idx_combo = ttk.Combobox(control_frame, textvariable=self.start_idx_var, 
-                                      values=start_idx_values, width=8, state="readonly")
-        start_idx_combo.grid(row=0, column=3, padx=(0, 10))
+        start_idx_spin = ttk.Spinbox(control_frame, textvariable=self.start_idx_var,
+                                     from_=0, to=63, width=8, state="readonly")  # 0 to 63
+        start_idx_spin.grid(row=0, column=3, padx=(0, 10))
         
         # Length
         ttk.Label(control_frame, text="Length:").grid(row=0, column=4, sticky="w", padx=(0, 5))
         self.length_var = tk.StringVar(value="1")
-        length_values = [str(i) for i in range(1, 65)]  # 1 to 64
-        length_combo = ttk.Combobox(control_frame, textvariable=self.length_var, 
-                                   values=length_values, width=8, state="readonly")
-        length_combo.grid(row=0, column=5, padx=(0, 10))
+        length_spin = ttk.Spinbox(control_frame, textvariable=self.length_var,
+                                  from_=1, to=64, width=8, state="readonly")  # 1 to 64
+        length_spin.grid(row=0, column=5, padx=(0, 10))
         
         # Action buttons
         ttk.Button(control_frame, text="Execute", command=self.execute_register_command).grid(row=0, column=6, padx=(0, 5))
@@ -188,23 +508,36 @@ class ModbusSimulatorGUI:
         self.register_vars = {}
         self.register_entries = {}
         
+        # Register values and their displayed text; the StringVars only mirror these
+        self._reg_values = array.array('H', [0] * 64)
+        self._reg_hex = ["0x0000"] * 64
+        
+        # Registers whose StringVar lags _reg_hex, pushed to Tk in one idle callback
+        self._dirty_regs = set()
+        self._reg_flush_id = None
+        
+        # One style and one named font shared by every register box
+        ttk.Style(self.root).configure("Register.TLabel", font=("Arial", 8, "bold"))
+        entry_font = tkfont.Font(root=self.root, family="Arial", size=8)
+        
         # Create register boxes (0-63 for expanded range) in fixed 8x8 grid
-        for i in range(64):
+        for i, label_text in enumerate(_REG_LABELS):
             row = i // 8
             col = i % 8
             
             # Register frame with increased width
-            reg_frame = ttk.Frame(registers_frame, relief="solid", borderwidth=1)
+            reg_frame = ttk.Frame(registers_frame, relief="solid", borderwidth=1, width=150)  # Increased width for 0x prefix
             reg_frame.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
-            reg_frame.configure(width=150)  # Increased width for 0x prefix
             
             # Register index label (left side)
-            idx_label = ttk.Label(reg_frame, text=f"{i:02d}", font=("Arial", 8, "bold"))
+            idx_label = ttk.Label(reg_frame, text=label_text, style="Register.TLabel")
             idx_label.pack(side="left", padx=3, pady=2)
             
             # Value display/input (right side) - wider entry field (read-only)
             self.register_vars[i] = tk.StringVar(value="0x0000")
-            entry = ttk.Entry(reg_frame, textvariable=self.register_vars[i], width=10, justify="center", font=("Arial", 8), state="readonly")
+            # Mirror every change (typing, pasting, padding) into the register model
+            self.register_vars[i].trace_add('write', lambda *args, reg=i: self.sync_register(reg))
+            entry = ttk.Entry(reg_frame, textvariable=self.register_vars[i], width=10, justify="center", font=entry_font, state="readonly")
             entry.pack(side="right", padx=3, pady=2)
             self.register_entries[i] = entry
             
@@ -229,14 +562,51 @@ class ModbusSimulatorGUI:
         self.register_frame.pack(fill="both", expand=True, padx=10, pady=5)
         self.results_frame.pack(fill="x", padx=10, pady=5)
         
-        # Initial refresh of ports
-        self.refresh_ports()
+        # Initial refresh of ports (the scan thread reports back once the main loop runs)
+        self.root.after_idle(self.refresh_ports)
+    
+    def mirror_input_vars(self):
+        """Mirror input StringVars into plain attributes so reading them needs no Tcl call"""
+        for var_name, attr in _MIRRORED_VARS:
+            var = getattr(self, var_name)
+            setattr(self, attr, var.get())
+            var.trace_add('write', lambda *args, var=var, attr=attr: setattr(self, attr, var.get()))
     
     def refresh_ports(self):
         """Refresh available serial ports"""
-        ports = [port.device for port in serial.tools.list_ports.comports()]
+        # Reuse a scan from the last second instead of scanning again
+        if self._ports_ts is not None and time.monotonic() - self._ports_ts < _PORTS_CACHE_TTL:
+            self.apply_ports(self._ports_cache)
+            return
+        # A scan already running will show its result; don't start a second one
+        if self._ports_scanning:
+            return
+        self._ports_scanning = True
+        threading.Thread(target=self._scan_ports, daemon=True).start()
+    
+    def _scan_ports(self):
+        """List serial ports off the Tk thread (registry / sysfs access can be slow)"""
+        try:
+            ports = [port.device for port in serial.tools.list_ports.comports()]
+            error = None
+        except Exception as e:
+            ports, error = None, e
+        self.post_to_ui(self._ports_scanned, ports, error)
+    
+    def _ports_scanned(self, ports, error):
+        """Cache a finished port scan and show it"""
+        self._ports_scanning = False
+        if error is not None:
+            self.log_message(f"Failed to list serial ports: {str(error)}", "WARNING")
+            return
+        self._ports_cache = ports
+        self._ports_ts = time.monotonic()
+        self.apply_ports(ports)
+    
+    def apply_ports(self, ports):
+        """Show the scanned ports in the port selector"""
         self.port_combo['values'] = ports
-        if ports and not self.port_var.get():
+        if ports and not self._port:
             self.port_var.set(ports[0])
     
     def toggle_connection(self):
@@ -249,14 +619,20 @@ class ModbusSimulatorGUI:
     def connect(self):
         """Connect to Modbus device using mbpoll or fallback to PyModbus"""
         try:
-            port = self.port_var.get()
-            baudrate = int(self.baud_var.get())
-            slave_id = int(self.slave_id_var.get())
+            port = self._port
+            baudrate = int(self._baud)
+            slave_id = int(self._slave_id)
+            timeout = float(self._timeout)
+            retries = int(self._retries)
             
             if not port:
                 messagebox.showerror("Error", "Please select a serial port")
                 return
             
+            if timeout <= 0 or retries < 0:
+                messagebox.showerror("Error", "Timeout must be positive and retries cannot be negative")
+                return
+            
             # Use PyModbus directly
             self.log_message("Connecting using PyModbus", "INFO")
             self.client = ModbusSerialClient(
@@ -265,13 +641,14 @@ class ModbusSimulatorGUI:
                 bytesize=8,
                 parity='N',
                 stopbits=1,
-                timeout=5,
-                retries=3
+                timeout=timeout,
+                retries=retries
             )
     
             
             if self.client.connect():
                 self.is_connected = True
+                self._silent_interval = _rtu_silent_interval(baudrate)
                 self.connect_btn.config(state="disabled")
                 self.disconnect_btn.config(state="normal")
                 self.status_var.set("Connected")
@@ -285,9 +662,11 @@ class ModbusSimulatorGUI:
     
     def disconnect(self):
         """Disconnect from Modbus device"""
-        if self.client:
-            self.client.close()
-            self.client = None
+        with self._client_lock:
+            if self.client:
+                self.client.close()
+                self.client = None
+        self.invalidate_read_cache()
         
         self.is_connected = False
         self.connect_btn.config(state="normal")
@@ -298,7 +677,7 @@ class ModbusSimulatorGUI:
     
     def on_cmd_type_change(self, event=None):
         """Handle command type change"""
-        cmd_type = self.cmd_type_var.get()
+        cmd_type = self._cmd_type
         self.update_register_entry_states(cmd_type)
     
     def update_register_entry_states(self, cmd_type):
@@ -322,7 +701,7 @@ class ModbusSimulatorGUI:
         # Remove 0x prefix if present and non-hex characters
         if current_value.startswith('0X'):
             current_value = current_value[2:]
-        hex_chars = ''.join(c for c in current_value if c in '0123456789ABCDEF')
+        hex_chars = current_value.translate(_NON_HEX_DEL).encode('ascii', 'ignore').decode('ascii')
         
         # Limit to 4 characters (16-bit register)
         if len(hex_chars) > 4:
@@ -343,7 +722,7 @@ class ModbusSimulatorGUI:
         # Remove 0x prefix if present and non-hex characters
         if current_value.startswith('0X'):
             current_value = current_value[2:]
-        hex_chars = ''.join(c for c in current_value if c in '0123456789ABCDEF')
+        hex_chars = current_value.translate(_NON_HEX_DEL).encode('ascii', 'ignore').decode('ascii')
         
         # When user finishes editing, add 0x prefix and pad to 4 digits
         if len(hex_chars) == 0:
@@ -358,104 +737,32 @@ class ModbusSimulatorGUI:
             hex_chars = "0x" + hex_chars[:4]
             self.register_vars[reg_index].set(hex_chars)
     
-    def modbus_crc16(self, data):
-        """Calculate Modbus CRC16 for the given data bytes"""
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte
-            for i in range(8):
-                if crc & 0x01:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc = crc >> 1
+    def sync_register(self, reg_index):
+        """Store an entry's text and, when it is a hex number, its value"""
+        hex_value = self.register_vars[reg_index].get()
+        self._reg_hex[reg_index] = hex_value
+        if _REG_TEXT_RE.match(hex_value):
+            self._reg_values[reg_index] = int(hex_value, 16)
+    
+    def modbus_crc16(self, data: bytes) -> int:
+        """Calculate Modbus CRC16 for the given frame bytes"""
+        if _crc16_numba is not None and len(data) >= _CRC16_JIT_MIN_LEN:
+            buf = np.frombuffer(data, dtype=np.uint8)
+            crc = int(_crc16_numba(buf, _CRC16_TABLE_NP))
+        else:
+            # Bind the table to a local so the loop skips the global lookup per byte
+            table = _CRC16_TABLE
+            crc = 0xFFFF
+            for byte in data:
+                crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
         # Return CRC with byte order swapped (LSB first, MSB second)
         return (crc >> 8) | (crc << 8)
     
     def log_modbus_frame(self, cmd_type, start_idx, length, slave_id, values=None):
         """Log the Modbus frame bytes that would be sent"""
         try:
-            if cmd_type == "Read Holding Registers":
-                # Function code 0x03
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x03,               # Function code (Read Holding Registers)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (length >> 8) & 0xFF,     # Quantity high byte
-                    length & 0xFF       # Quantity low byte
-                ]
-                
-            elif cmd_type == "Write Holding Registers":
-                # Function code 0x10
-                byte_count = length * 2  # 2 bytes per register
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x10,               # Function code (Write Multiple Registers)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (length >> 8) & 0xFF,     # Quantity high byte
-                    length & 0xFF,      # Quantity low byte
-                    byte_count          # Byte count
-                ]
-                # Add register values (high byte, low byte for each)
-                for value in values:
-                    frame_bytes.append((value >> 8) & 0xFF)  # High byte
-                    frame_bytes.append(value & 0xFF)         # Low byte
-                    
-            elif cmd_type == "Write Single Register":
-                # Function code 0x06
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x06,               # Function code (Write Single Register)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (values[0] >> 8) & 0xFF,  # Value high byte
-                    values[0] & 0xFF    # Value low byte
-                ]
-                    
-            elif cmd_type == "Read Input Registers":
-                # Function code 0x04
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x04,               # Function code (Read Input Registers)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (length >> 8) & 0xFF,     # Quantity high byte
-                    length & 0xFF       # Quantity low byte
-                ]
-                
-            elif cmd_type == "Read Coils":
-                # Function code 0x01
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x01,               # Function code (Read Coils)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (length >> 8) & 0xFF,     # Quantity high byte
-                    length & 0xFF       # Quantity low byte
-                ]
-                
-            elif cmd_type == "Write Coils":
-                # Function code 0x0F
-                byte_count = (length + 7) // 8  # Calculate bytes needed for coils
-                frame_bytes = [
-                    slave_id,           # Slave ID
-                    0x0F,               # Function code (Write Multiple Coils)
-                    (start_idx >> 8) & 0xFF,  # Start address high byte
-                    start_idx & 0xFF,   # Start address low byte
-                    (length >> 8) & 0xFF,     # Quantity high byte
-                    length & 0xFF,      # Quantity low byte
-                    byte_count          # Byte count
-                ]
-                # Pack coils into bytes
-                coil_bytes = []
-                for i in range(0, length, 8):
-                    byte_val = 0
-                    for j in range(8):
-                        if i + j < length and values[i + j]:
-                            byte_val |= (1 << j)
-                    coil_bytes.append(byte_val)
-                frame_bytes.extend(coil_bytes)
+            function_code, build_frame = _CMD_SPEC[cmd_type]
+            frame_bytes = build_frame(slave_id, function_code, start_idx, length, values)
             
             # Calculate CRC16 for the frame
             crc = self.modbus_crc16(frame_bytes)
@@ -463,10 +770,10 @@ class ModbusSimulatorGUI:
             crc_low = (crc >> 8) & 0xFF
             
             # Add CRC bytes to frame (LSB first, MSB second)
-            complete_frame = frame_bytes + [crc_low, crc_high]
+            complete_frame = frame_bytes + bytes((crc_low, crc_high))
             
             # Display the complete frame with CRC
-            hex_frame = ' '.join([f"{b:02X}" for b in complete_frame])
+            hex_frame = complete_frame.hex(' ').upper()
             self.log_message(f"Modbus Frame: {hex_frame} (CRC: {crc_low:02X} {crc_high:02X})", "INFO")
             
         except Exception as e:
@@ -481,10 +788,10 @@ class ModbusSimulatorGUI:
             return
         
         try:
-            slave_id = int(self.slave_id_var.get())
-            start_idx = int(self.start_idx_var.get())
-            length = int(self.length_var.get())
-            cmd_type = self.cmd_type_var.get()
+            slave_id = int(self._slave_id)
+            start_idx = int(self._start_idx)
+            length = int(self._length)
+            cmd_type = self._cmd_type
             
             if start_idx < 0 or start_idx > 63:
                 messagebox.showerror("Error", "Start index must be between 0 and 63")
@@ -495,127 +802,216 @@ class ModbusSimulatorGUI:
                 return
             
             timestamp = datetime.now()
-            start_time = time.time()
             
-            # Execute command based on type
-            if cmd_type == "Read Holding Registers":
-                # Log the request details and frame
-                self.log_message(f"Sending Read Holding Registers: Start={start_idx}, Count={length}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, length, slave_id)
-                
-                # Use PyModbus client
-                result = self.client.read_holding_registers(start_idx, count=length, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time, is_read=True)
-                
-            elif cmd_type == "Write Holding Registers":
-                # For write operations, collect hex values from register entries
-                values = []
-                for i in range(length):
-                    reg_addr = start_idx + i
-                    if reg_addr in self.register_vars:
-                        try:
-                            hex_value = self.register_vars[reg_addr].get().strip()
-                            # Remove 0x prefix if present
-                            if hex_value.startswith('0x') or hex_value.startswith('0X'):
-                                hex_value = hex_value[2:]
-                            # Validate hex format (4 digits for 16-bit register)
-                            if len(hex_value) != 4:
-                                messagebox.showerror("Error", f"Register {reg_addr}: Please enter 4-digit hex value (e.g., 0x1234, 0xABCD)")
-                                return
-                            # Convert hex string to integer
-                            value = int(hex_value, 16)
-                            values.append(value)
-                        except ValueError:
-                            messagebox.showerror("Error", f"Register {reg_addr}: Invalid hex value. Please enter 4-digit hex values (0000-FFFF).")
-                            return
-                
-                # Log the request details with values and frame
-                hex_values = [f"{v:04X}" for v in values]
-                self.log_message(f"Sending Write Holding Registers: Start={start_idx}, Values={hex_values}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, length, slave_id, values)
+            method_name, needs_values = _CLIENT_CALLS[cmd_type]
+            
+            if not needs_values:
+                # Queue the read so reads issued in quick succession can share one request
+                self._pending_reads.append((cmd_type, slave_id, start_idx, length))
+                if self._read_flush_id is None:
+                    self._read_flush_id = self.root.after(_READ_COALESCE_MS, self.flush_pending_reads)
+                return
+            
+            # Keep request order: send reads still waiting in the window before this write
+            if self._read_flush_id is not None:
+                self.root.after_cancel(self._read_flush_id)
+                self.flush_pending_reads()
+            
+            # Any write may change what the cached reads returned
+            self.invalidate_read_cache()
+            
+            if cmd_type == "Write Coils":
+                # Collect values from the register display (0 or 1)
+                values = self.collect_coil_values(start_idx, length)
+                if values is None:
+                    return
                 
-                # Use PyModbus client
-                result = self.client.write_registers(start_idx, values, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time, is_read=False, values=values)
+                coil_values = [str(int(v)) for v in values]
+                self.log_message(f"Sending Write Coils: Start={start_idx}, Values={coil_values}, Device ID={slave_id}", "INFO")
+                request_values = values
                 
             elif cmd_type == "Write Single Register":
                 # For single register write, only use the first register value
-                if start_idx not in self.register_vars:
-                    messagebox.showerror("Error", f"Register {start_idx} not found")
+                length = 1
+                values = self.collect_register_values(start_idx, length)
+                if values is None:
                     return
                 
-                try:
-                    hex_value = self.register_vars[start_idx].get().strip()
-                    # Remove 0x prefix if present
-                    if hex_value.startswith('0x') or hex_value.startswith('0X'):
-                        hex_value = hex_value[2:]
-                    # Validate hex format (4 digits for 16-bit register)
-                    if len(hex_value) != 4:
-                        messagebox.showerror("Error", f"Register {start_idx}: Please enter 4-digit hex value (e.g., 0x1234, 0xABCD)")
-                        return
-                    # Convert hex string to integer
-                    value = int(hex_value, 16)
-                except ValueError:
-                    messagebox.showerror("Error", f"Register {start_idx}: Invalid hex value. Please enter 4-digit hex values (0000-FFFF).")
-                    return
-                
-                # Log the request details with value and frame
-                self.log_message(f"Sending Write Single Register: Address={start_idx}, Value={value:04X}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, 1, slave_id, [value])
-                
-                # Use PyModbus client - use write_register for single register
-                result = self.client.write_register(start_idx, value, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, 1, timestamp, start_time, is_read=False, values=[value])
-                
-            elif cmd_type == "Read Input Registers":
-                self.log_message(f"Sending Read Input Registers: Start={start_idx}, Count={length}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, length, slave_id)
+                self.log_message(f"Sending Write Single Register: Address={start_idx}, Value={values[0]:04X}, Device ID={slave_id}", "INFO")
+                request_values = values[0]
                 
-                # Use PyModbus client
-                result = self.client.read_input_registers(start_idx, count=length, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time, is_read=True)
-                
-            elif cmd_type == "Read Coils":
-                self.log_message(f"Sending Read Coils: Start={start_idx}, Count={length}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, length, slave_id)
-                
-                # Use PyModbus client
-                result = self.client.read_coils(start_idx, count=length, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time, is_read=True)
-                
-            elif cmd_type == "Write Coils":
-                # Collect values from the register display (0 or 1)
-                values = []
-                for i in range(length):
-                    reg_addr = start_idx + i
-                    if reg_addr in self.register_vars:
-                        try:
-                            value = int(self.register_vars[reg_addr].get())
-                            if value not in [0, 1]:
-                                messagebox.showerror("Error", f"Coil value in register {reg_addr} must be 0 or 1.")
-                                return
-                            values.append(bool(value))
-                        except ValueError:
-                            messagebox.showerror("Error", f"Invalid value in register {reg_addr}. Please use Execute with proper values.")
-                            return
-                
-                # Log the request details with values and frame
-                coil_values = [str(int(v)) for v in values]
-                self.log_message(f"Sending Write Coils: Start={start_idx}, Values={coil_values}, Device ID={slave_id}", "INFO")
-                self.log_modbus_frame(cmd_type, start_idx, length, slave_id, values)
+            else:
+                # For write operations, collect hex values from register entries
+                values = self.collect_register_values(start_idx, length)
+                if values is None:
+                    return
                 
-                # Use PyModbus client
-                result = self.client.write_coils(start_idx, values, device_id=slave_id)
-                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time, is_read=False, values=values)
+                hex_values = _hex_words(values)
+                self.log_message(f"Sending Write Holding Registers: Start={start_idx}, Values={hex_values}, Device ID={slave_id}", "INFO")
+                request_values = values
+            
+            self.log_modbus_frame(cmd_type, start_idx, length, slave_id, values)
+            
+            def on_done(result, start_time, end_time):
+                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time,
+                                            is_read=False, values=values, end_time=end_time)
+            
+            # Use PyModbus client on the worker thread
+            self.submit_modbus_request(operator.methodcaller(method_name, start_idx, request_values, device_id=slave_id),
+                                       on_done)
                 
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers for start index and length")
         except Exception as e:
             self.log_message(f"Error executing command: {str(e)}", "ERROR")
     
-    def handle_register_result(self, result, cmd_type, start_idx, length, timestamp, start_time, is_read=True, values=None):
+    def invalidate_read_cache(self):
+        """Drop cached reads and keep reads still in flight from storing their results"""
+        self._read_cache.clear()
+        self._cache_gen += 1
+    
+    def flush_pending_reads(self):
+        """Send the queued reads, merging overlapping or adjacent ranges"""
+        self._read_flush_id = None
+        pending, self._pending_reads = self._pending_reads, []
+        if not self.is_connected:
+            return
+        
+        for cmd_type, slave_id, start_idx, length in _merge_read_ranges(pending):
+            self.send_read_request(cmd_type, slave_id, start_idx, length)
+    
+    def send_read_request(self, cmd_type, slave_id, start_idx, length):
+        """Send one read command and display its result"""
+        try:
+            timestamp = datetime.now()
+            start_time = time.time()
+            
+            # Reuse a recent identical read instead of polling the device again
+            cache_key = (slave_id, _CMD_SPEC[cmd_type][0], start_idx, length)
+            cached = self._read_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self._read_ttl:
+                self.log_message(f"{cmd_type}: Start={start_idx}, Count={length}, Device ID={slave_id} served from cache", "INFO")
+                self.handle_register_result(cached[1], cmd_type, start_idx, length, timestamp, start_time, is_read=True)
+                return
+            
+            # Log the request details and frame
+            self.log_message(f"Sending {cmd_type}: Start={start_idx}, Count={length}, Device ID={slave_id}", "INFO")
+            self.log_modbus_frame(cmd_type, start_idx, length, slave_id)
+            
+            cache_gen = self._cache_gen
+            
+            def on_done(result, start_time, end_time):
+                # Skip caching if a write was issued since this read was queued
+                if self._read_ttl > 0 and cache_gen == self._cache_gen and not result.isError():
+                    self._read_cache[cache_key] = (time.monotonic(), result)
+                self.handle_register_result(result, cmd_type, start_idx, length, timestamp, start_time,
+                                            is_read=True, end_time=end_time)
+            
+            # Use PyModbus client on the worker thread
+            method_name, _ = _CLIENT_CALLS[cmd_type]
+            self.submit_modbus_request(operator.methodcaller(method_name, start_idx, count=length, device_id=slave_id),
+                                       on_done)
+        except Exception as e:
+            self.log_message(f"Error executing command: {str(e)}", "ERROR")
+    
+    def submit_modbus_request(self, call, on_done):
+        """Queue a PyModbus client call; on_done(result, start_time, end_time) runs on the Tk thread
+        
+        call(client) runs on the worker thread and returns the result handed to on_done.
+        """
+        self._cmd_queue.put((call, on_done))
+    
+    def _modbus_worker(self):
+        """Run queued PyModbus calls so slow devices never block the GUI"""
+        while True:
+            # Take every request already queued; the batch goes out back to back
+            # and its results reach Tk in one hand-off
+            batch = [self._cmd_queue.get()]
+            try:
+                while True:
+                    batch.append(self._cmd_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            for index, (call, on_done) in enumerate(batch):
+                if index:
+                    # Keep the RTU inter-frame silence between consecutive requests
+                    time.sleep(self._silent_interval)
+                start_time = time.time()
+                try:
+                    with self._client_lock:
+                        if self.client is None:
+                            raise ConnectionError("Not connected to Modbus device")
+                        result = call(self.client)
+                    outcome = (on_done, result, None, start_time, time.time())
+                except Exception as e:
+                    outcome = (on_done, None, e, start_time, time.time())
+                self._result_queue.put(outcome)
+            self.post_to_ui(self.process_modbus_results)
+    
+    def process_modbus_results(self):
+        """Hand finished PyModbus calls to their callbacks on the Tk thread"""
+        while True:
+            try:
+                on_done, result, error, start_time, end_time = self._result_queue.get_nowait()
+            except queue.Empty:
+                return
+            
+            if error is not None:
+                self.log_message(f"Error executing command: {str(error)}", "ERROR")
+                continue
+            
+            try:
+                on_done(result, start_time, end_time)
+            except Exception as e:
+                self.log_message(f"Error executing command: {str(e)}", "ERROR")
+    
+    def collect_register_values(self, start_idx, length):
+        """Return the register values to write, or None after showing an error"""
+        reg_hex = self._reg_hex[start_idx:start_idx + length]
+        if not all(map(_REG_WORD_RE.match, reg_hex)):
+            reg_addr = start_idx + next(i for i, hex_value in enumerate(reg_hex) if not _REG_WORD_RE.match(hex_value))
+            messagebox.showerror("Error", f"Register {reg_addr}: Please enter 4-digit hex value (e.g., 0x1234, 0xABCD)")
+            return None
+        return self._reg_values[start_idx:start_idx + length].tolist()
+    
+    def collect_coil_values(self, start_idx, length):
+        """Return the 0/1 coil values to write, or None after showing an error"""
+        reg_hex = self._reg_hex[start_idx:start_idx + length]
+        if not all(map(_REG_TEXT_RE.match, reg_hex)):
+            reg_addr = start_idx + next(i for i, hex_value in enumerate(reg_hex) if not _REG_TEXT_RE.match(hex_value))
+            messagebox.showerror("Error", f"Invalid value in register {reg_addr}. Please use Execute with proper values.")
+            return None
+        values = self._reg_values[start_idx:start_idx + length]
+        if max(values) > 1:
+            reg_addr = start_idx + next(i for i, value in enumerate(values) if value > 1)
+            messagebox.showerror("Error", f"Coil value in register {reg_addr} must be 0 or 1.")
+            return None
+        return [value == 1 for value in values]
+    
+    def update_register(self, reg_addr, value, hex_value):
+        """Store a register value and schedule its entry update only if the text changed"""
+        self._reg_values[reg_addr] = value
+        if self._reg_hex[reg_addr] != hex_value:
+            self._reg_hex[reg_addr] = hex_value
+            self._dirty_regs.add(reg_addr)
+            if self._reg_flush_id is None:
+                self._reg_flush_id = self.root.after_idle(self.apply_register_updates)
+    
+    def apply_register_updates(self):
+        """Push every changed register text to its entry in one pass"""
+        self._reg_flush_id = None
+        register_vars = self.register_vars
+        reg_hex = self._reg_hex
+        for reg_addr in self._dirty_regs:
+            register_vars[reg_addr].set(reg_hex[reg_addr])
+        self._dirty_regs.clear()
+    
+    def handle_register_result(self, result, cmd_type, start_idx, length, timestamp, start_time, is_read=True, values=None, end_time=None):
         """Handle the result of register operations"""
-        response_time = (time.time() - start_time) * 1000
+        if end_time is None:
+            end_time = time.time()
+        response_time = (end_time - start_time) * 1000
         
         if result.isError():
             error_msg = str(result)
@@ -629,17 +1025,21 @@ class ModbusSimulatorGUI:
             self.log_message("Expected Response: Device should echo back the same frame", "INFO")
             self.log_message("Actual Response: No response received (timeout or communication error)", "ERROR")
         else:
+            # Decide the branch and build the command label once for the log line and history
+            is_register = "Register" in cmd_type
+            end_idx = start_idx + length - 1
+            command = f"{cmd_type} {start_idx}-{end_idx}"
+            
             if is_read:
                 # Handle read operations
-                if "Register" in cmd_type:
+                update_register = self.update_register
+                if is_register:
                     read_values = result.registers
-                    # Update register display (display as hex)
-                    for i, value in enumerate(read_values):
+                    # Update register display (display as 4-digit hex, 16-bit register)
+                    for i, hex_word in enumerate(_hex_words(read_values)):
                         reg_addr = start_idx + i
                         if reg_addr in self.register_vars:
-                            # Display as 4-digit hex (16-bit register)
-                            hex_value = f"0x{value:04X}"
-                            self.register_vars[reg_addr].set(hex_value)
+                            update_register(reg_addr, read_values[i], "0x" + hex_word)
                 else:  # Coils
                     read_values = result.bits
                     # Update register display (display as hex)
@@ -647,65 +1047,44 @@ class ModbusSimulatorGUI:
                         reg_addr = start_idx + i
                         if reg_addr in self.register_vars:
                             # Display as 4-digit hex (16-bit register)
-                            hex_value = f"0x{int(value):04X}"
-                            self.register_vars[reg_addr].set(hex_value)
+                            update_register(reg_addr, int(value), _COIL_HEX[value])
                 
-                self.log_message(f"{cmd_type} {start_idx}-{start_idx+length-1}: {read_values}, Response Time: {response_time:.2f}ms", "SUCCESS")
-                
-                # Log raw response bytes (if available from PyModbus)
-                # Note: PyModbus doesn't expose raw response bytes, so we show processed data
-                if "Register" in cmd_type:
-                    self.log_message(f"Response Data: {read_values} (PyModbus processed response)", "INFO")
-                else:  # Coils
-                    self.log_message(f"Response Data: {read_values} (PyModbus processed response)", "INFO")
+                self.log_message(f"{command}: {read_values}, Response Time: {response_time:.2f}ms", "SUCCESS")
                 
                 # Store in history
-                self.command_history.append({
-                    'timestamp': timestamp.isoformat(),
-                    'command': f"{cmd_type} {start_idx}-{start_idx+length-1}",
-                    'address': start_idx,
-                    'count': length,
-                    'values': read_values,
-                    'response_time_ms': response_time,
-                    'success': True
-                })
+                self.command_history.append(CmdRecord(timestamp.isoformat(), command, start_idx, length,
+                                                      read_values, response_time, True, None))
             else:
                 # Handle write operations
-                self.log_message(f"{cmd_type} {start_idx}-{start_idx+length-1}: {values}, Response Time: {response_time:.2f}ms", "SUCCESS")
+                self.log_message(f"{command}: {values}, Response Time: {response_time:.2f}ms", "SUCCESS")
                 
                 # Log write response (echo back the written values)
                 if values:
                     self.log_message(f"Write Response: Echo back values {values} (Write operation confirmed)", "INFO")
                 
                 # Store in history
-                self.command_history.append({
-                    'timestamp': timestamp.isoformat(),
-                    'command': f"{cmd_type} {start_idx}-{start_idx+length-1}",
-                    'address': start_idx,
-                    'count': length,
-                    'values': values,
-                    'response_time_ms': response_time,
-                    'success': True
-                })
+                self.command_history.append(CmdRecord(timestamp.isoformat(), command, start_idx, length,
+                                                      values, response_time, True, None))
     
     def clear_all_registers(self):
         """Clear all register values in the display"""
-        for var in self.register_vars.values():
-            var.set("0x0000")
+        for reg_addr in self.register_vars:
+            self.update_register(reg_addr, 0, "0x0000")
         self.log_message("All register values cleared", "INFO")
     
     def validate_raw_input(self, event=None):
         """Validate raw hex input format"""
-        current_value = self.raw_bytes_var.get().upper()
+        current_value = self._raw_bytes.upper()
         
-        # Remove non-hex and non-space characters
-        cleaned = ''.join(c for c in current_value if c in '0123456789ABCDEF ')
+        # Remove spaces and non-hex characters
+        hex_chars = current_value.translate(_NON_HEX_DEL).encode('ascii', 'ignore').decode('ascii')
         
         # Ensure proper spacing between bytes
-        hex_chars = cleaned.replace(' ', '')
         if len(hex_chars) > 0:
-            # Add spaces every 2 characters
-            spaced = ' '.join([hex_chars[i:i+2] for i in range(0, len(hex_chars), 2)])
+            # Add spaces every 2 characters (a trailing odd digit is still being typed)
+            spaced = bytes.fromhex(hex_chars[:len(hex_chars) & ~1]).hex(' ').upper()
+            if len(hex_chars) & 1:
+                spaced = f"{spaced} {hex_chars[-1]}" if spaced else hex_chars
             if spaced != current_value:
                 self.raw_bytes_var.set(spaced)
     
@@ -715,7 +1094,7 @@ class ModbusSimulatorGUI:
             messagebox.showerror("Error", "Not connected to Modbus device")
             return
         
-        raw_input = self.raw_bytes_var.get().strip()
+        raw_input = self._raw_bytes.strip()
         if not raw_input:
             messagebox.showerror("Error", "Please enter raw bytes")
             return
@@ -728,21 +1107,22 @@ class ModbusSimulatorGUI:
                 return
             
             # Validate hex format
-            frame_bytes = []
-            for part in hex_parts:
-                if len(part) != 2:
-                    messagebox.showerror("Error", f"Invalid hex byte: {part}. Each byte must be 2 hex digits (e.g., 01, FF)")
-                    return
-                try:
-                    byte_val = int(part, 16)
-                    frame_bytes.append(byte_val)
-                except ValueError:
-                    messagebox.showerror("Error", f"Invalid hex value: {part}")
-                    return
+            if not _HEX_LINE_RE.match(raw_input):
+                # Point at the first byte that is malformed
+                for part in hex_parts:
+                    if len(part) != 2:
+                        messagebox.showerror("Error", f"Invalid hex byte: {part}. Each byte must be 2 hex digits (e.g., 01, FF)")
+                        return
+                    if not _HEX_LINE_RE.match(part):
+                        messagebox.showerror("Error", f"Invalid hex value: {part}")
+                        return
+                messagebox.showerror("Error", f"Invalid hex bytes: {raw_input}")
+                return
+            frame = bytes.fromhex(raw_input)
             
             # Validate basic Modbus format
-            slave_id = frame_bytes[0]
-            function_code = frame_bytes[1]
+            slave_id = frame[0]
+            function_code = frame[1]
             
             if slave_id < 1 or slave_id > 247:
                 messagebox.showerror("Error", f"Invalid slave ID: {slave_id}. Must be 1-247")
@@ -753,95 +1133,130 @@ class ModbusSimulatorGUI:
                 return
             
             # Calculate CRC and add to frame
-            crc = self.modbus_crc16(frame_bytes)
+            crc = self.modbus_crc16(frame)
             crc_low = crc & 0xFF
             crc_high = (crc >> 8) & 0xFF
-            complete_frame = frame_bytes + [crc_high, crc_low]
+            complete_frame = frame + bytes((crc_high, crc_low))
             
             # Log the complete frame
-            hex_frame = ' '.join([f"{b:02X}" for b in complete_frame])
+            hex_frame = complete_frame.hex(' ').upper()
             self.log_message(f"Sending Raw Command: {hex_frame} (CRC: {crc_low:02X} {crc_high:02X})", "INFO")
             
             # Send the raw command using PyModbus
             timestamp = datetime.now()
-            start_time = time.time()
             
-            # Send raw bytes directly through the serial connection
-            if hasattr(self.client, 'socket') and self.client.socket:
-                # Send the raw frame
-                self.client.socket.write(bytes(complete_frame))
-                
-                # Read response (this is a simplified approach)
-                # In a real implementation, you'd need to parse the response properly
-                response_time = (time.time() - start_time) * 1000
+            def on_done(response, start_time, end_time):
+                response_time = (end_time - start_time) * 1000
                 
-                self.log_message(f"Raw Command Sent: {hex_frame}, Response Time: {response_time:.2f}ms", "SUCCESS")
-                self.log_message("Note: Raw command sent successfully. Response parsing not implemented for raw commands.", "INFO")
+                # A frame followed by its own CRC has a CRC of zero
+                success = len(response) >= 4 and self.modbus_crc16(response) == 0
+                hex_response = response.hex(' ').upper()
+                if not response:
+                    self.log_message(f"Raw Command Error: No response, Response Time: {response_time:.2f}ms", "ERROR")
+                elif not success:
+                    self.log_message(f"Raw Response: {hex_response} (invalid CRC), "
+                                     f"Response Time: {response_time:.2f}ms", "ERROR")
+                elif response[1] & 0x80:
+                    self.log_message(f"Raw Response: {hex_response} (exception code 0x{response[2]:02X}), "
+                                     f"Response Time: {response_time:.2f}ms", "WARNING")
+                else:
+                    self.log_message(f"Raw Response: {hex_response}, "
+                                     f"Response Time: {response_time:.2f}ms", "SUCCESS")
                 
                 # Store in history
-                self.command_history.append({
-                    'timestamp': timestamp.isoformat(),
-                    'command': f"Raw Command: {hex_frame}",
-                    'raw_bytes': hex_frame,
-                    'response_time_ms': response_time,
-                    'success': True
-                })
-            else:
-                self.log_message("Raw Command Error: No active serial connection", "ERROR")
+                self.command_history.append(CmdRecord(timestamp.isoformat(), f"Raw Command: {hex_frame}", None, None,
+                                                      None, response_time, success, hex_frame))
+            
+            # Keep request order: send reads still waiting in the window before this command
+            if self._read_flush_id is not None:
+                self.root.after_cancel(self._read_flush_id)
+                self.flush_pending_reads()
+            
+            # A raw command may write (FC 05/06/0F/10), so cached reads can no longer be trusted
+            self.invalidate_read_cache()
+            
+            # Send raw bytes through the serial connection on the worker, reading
+            # exactly the expected response length instead of waiting for the timeout
+            response_size = _expected_rtu_response_size(frame)
+            self.submit_modbus_request(lambda client: _raw_exchange(client, complete_frame, response_size), on_done)
             
         except Exception as e:
             self.log_message(f"Raw Command Error: {str(e)}", "ERROR")
 
     
     def log_message(self, message, level="INFO"):
-        """Add message to log queue"""
-        self.log_queue.put({
-            'timestamp': datetime.now(),
-            'message': message,
-            'level': level
-        })
+        """Add message to log queue (timestamps are formatted when the batch is displayed)"""
+        self.log_queue.put((time.time(), level, message))
     
     def start_log_processor(self):
-        """Start the log processing thread"""
-        def process_logs():
-            while True:
-                try:
-                    log_entry = self.log_queue.get(timeout=0.1)
-                    self.display_log_entry(log_entry)
-                except queue.Empty:
-                    continue
-                except Exception as e:
-                    print(f"Log processing error: {e}")
-        
-        log_thread = threading.Thread(target=process_logs, daemon=True)
-        log_thread.start()
-    
-    def display_log_entry(self, log_entry):
-        """Display log entry in the GUI"""
-        timestamp = log_entry['timestamp'].strftime("%H:%M:%S.%f")[:-3]
-        level = log_entry['level']
-        message = log_entry['message']
-        
-        # Color coding
-        colors = {
-            'INFO': 'black',
-            'SUCCESS': 'green',
-            'ERROR': 'red',
-            'WARNING': 'orange'
-        }
-        
-        color = colors.get(level, 'black')
+        """Start the thread that batches queued log entries for display"""
+        threading.Thread(target=self._log_worker, daemon=True).start()
+    
+    def stop_log_processor(self):
+        """Let the log thread exit once it has drained the queue"""
+        self.log_queue.put(None)
+    
+    def _log_worker(self):
+        """Block until log entries arrive, then hand everything queued to Tk as one batch"""
+        running = True
+        while running:
+            batch = [self.log_queue.get()]
+            try:
+                while len(batch) < _LOG_BATCH_MAX:
+                    batch.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            # A None entry from stop_log_processor ends the thread after this batch
+            if None in batch:
+                running = False
+                del batch[batch.index(None):]
+            
+            if batch:
+                self.post_to_ui(self.flush_log_batch, batch)
+    
+    def flush_log_batch(self, batch):
+        """Display a batch of log entries handed over by the log thread"""
+        try:
+            self.display_log_entries(batch)
+        except Exception as e:
+            print(f"Log processing error: {e}")
+    
+    def post_to_ui(self, callback, *args):
+        """Run callback on the Tk thread; safe to call from worker threads"""
+        try:
+            self.root.after_idle(callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Main loop has stopped, the window is closing
+    
+    def display_log_entries(self, log_entries):
+        """Display log entries in the GUI with one insert"""
+        # Alternating text/tag arguments let a single insert color every line
+        chunks = []
+        for timestamp, level, message in log_entries:
+            # Only format the clock once per second; milliseconds are appended directly
+            sec = int(timestamp)
+            if sec != self._ts_sec:
+                self._ts_sec = sec
+                self._ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+            chunks.append(f"[{self._ts_str}.{int((timestamp - sec) * 1000):03d}] {message}\n")
+            chunks.append(level)
         
-        # Insert with color
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.log_text.insert(tk.END, *chunks)
         
-        # Apply color to the last line
-        start_line = self.log_text.index(tk.END + "-2l")
-        end_line = self.log_text.index(tk.END + "-1l")
-        self.log_text.tag_add(level, start_line, end_line)
-        self.log_text.tag_config(level, foreground=color)
+        # Keep the widget bounded so long sessions don't grow it without limit
+        # (every entry ends with a newline, so the last line index is one past the last entry)
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > _LOG_MAX_LINES:
+            self.log_text.delete('1.0', f"{line_count - _LOG_MAX_LINES + 1}.0")
         
-        # Auto-scroll to bottom
+        # Auto-scroll to bottom, at most once per _LOG_SEE_MS however often batches arrive
+        if self._log_see_id is None:
+            self._log_see_id = self.root.after(_LOG_SEE_MS, self.scroll_log_to_end)
+    
+    def scroll_log_to_end(self):
+        """Scroll the log display to its last line"""
+        self._log_see_id = None
         self.log_text.see(tk.END)
     
     def clear_log(self):
@@ -862,12 +1277,15 @@ class ModbusSimulatorGUI:
         
         if filename:
             try:
+                # Build the CSV in memory and write it in one call; a row that fails
+                # to serialize then leaves any existing file untouched
+                buffer = io.StringIO(newline='')
+                writer = csv.writer(buffer)
+                writer.writerow(CmdRecord.__slots__)
+                writer.writerows(map(_RECORD_FIELDS, self.command_history))
+                
                 with open(filename, 'w', newline='') as csvfile:
-                    if self.command_history:
-                        fieldnames = self.command_history[0].keys()
-                        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                        writer.writeheader()
-                        writer.writerows(self.command_history)
+                    csvfile.write(buffer.getvalue())
                 
                 self.log_message(f"Command history exported to {filename}", "SUCCESS")
             except Exception as e:
@@ -886,8 +1304,13 @@ class ModbusSimulatorGUI:
         
         if filename:
             try:
-                with open(filename, 'w') as jsonfile:
-                    json.dump(self.command_history, jsonfile, indent=2)
+                if orjson is not None:
+                    # Serialize in C (records natively, as dataclasses) and write the result in one call
+                    with open(filename, 'wb') as jsonfile:
+                        jsonfile.write(orjson.dumps(list(self.command_history), option=orjson.OPT_INDENT_2))
+                else:
+                    with open(filename, 'w') as jsonfile:
+                        json.dump([record.as_dict() for record in self.command_history], jsonfile, indent=2)
                 
                 self.log_message(f"Command history exported to {filename}", "SUCCESS")
             except Exception as e:
@@ -896,12 +1319,15 @@ class ModbusSimulatorGUI:
     def save_settings(self):
         """Save current settings"""
         settings = {
-            'port': self.port_var.get(),
-            'baudrate': self.baud_var.get(),
-            'slave_id': self.slave_id_var.get(),
-            'command_type': self.cmd_type_var.get(),
-            'address': self.address_var.get(),
-            'count': self.count_var.get()
+            'port': self._port,
+            'baudrate': self._baud,
+            'slave_id': self._slave_id,
+            'timeout': self._timeout,
+            'retries': self._retries,
+            'command_type': self._cmd_type,
+            'address': self._start_idx,
+            'count': self._length,
+            'read_cache_ttl': str(self._read_ttl)
         }
         
         filename = filedialog.asksaveasfilename(
@@ -910,33 +1336,53 @@ class ModbusSimulatorGUI:
         )
         
         if filename:
+            # Skip the write when this file already holds exactly these settings
+            settings_key = (os.path.abspath(filename), hash(json.dumps(settings, sort_keys=True)))
+            if settings_key == self._settings_key and os.path.exists(filename):
+                self.log_message(f"Settings unchanged, {filename} is up to date", "INFO")
+                return
+            
+            # Write to a temporary file and swap it in so a failed save never truncates the old file
+            temp_filename = filename + ".tmp"
             try:
-                with open(filename, 'w') as jsonfile:
+                with open(temp_filename, 'w') as jsonfile:
                     json.dump(settings, jsonfile, indent=2)
+                os.replace(temp_filename, filename)
                 
+                self._settings_key = settings_key
                 self.log_message(f"Settings saved to {filename}", "SUCCESS")
             except Exception as e:
+                # Don't leave a half-written temporary file behind
+                try:
+                    os.remove(temp_filename)
+                except OSError:
+                    pass
                 messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
     
     def load_settings(self):
         """Load settings from file"""
         try:
-            with open('modbus_settings.json', 'r') as jsonfile:
+            with open(_SETTINGS_FILE, 'r') as jsonfile:
                 settings = json.load(jsonfile)
                 
                 self.port_var.set(settings.get('port', ''))
                 self.baud_var.set(settings.get('baudrate', '115200'))
                 self.slave_id_var.set(settings.get('slave_id', '1'))
+                self.timeout_var.set(settings.get('timeout', '0.5'))
+                self.retries_var.set(settings.get('retries', '0'))
                 self.cmd_type_var.set(settings.get('command_type', 'Read Holding Registers'))
-                self.address_var.set(settings.get('address', '0'))
-                self.count_var.set(settings.get('count', '1'))
+                self.start_idx_var.set(settings.get('address', '0'))
+                self.length_var.set(settings.get('count', '1'))
+                self._read_ttl = max(0.0, float(settings.get('read_cache_ttl', '0')))
+                
+                # Remember what is on disk so saving the same settings again is a no-op
+                self._settings_key = (os.path.abspath(_SETTINGS_FILE), hash(json.dumps(settings, sort_keys=True)))
                 
         except FileNotFoundError:
             pass  # No settings file, use defaults
         except Exception as e:
             self.log_message(f"Failed to load settings: {str(e)}", "WARNING")
 
-
 def main():
     """Main application entry point"""
     root = tk.Tk()
@@ -946,6 +1392,7 @@ def main():
     def on_closing():
         if app.is_connected:
             app.disconnect()
+        app.stop_log_processor()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)